@@ -39,26 +39,23 @@ Implementation Notes
 * Adafruit Bus Device library:
   https://github.com/adafruit/Adafruit_CircuitPython_BusDevice
 
-* Adafruit binascii library:
-  https://github.com/adafruit/Adafruit_CircuitPython_binascii
-
 """
 
 import time
-from struct import pack
+from struct import pack, pack_into
 
 # Since the board may or may not have access to the typing library we need
 # to have this in a try/except to enable type  hinting for the IDEs while
 # not breaking the runtime on the controller.
 try:
-    from typing import Any, Sized, Optional
+    from typing import Any, Sized, Optional, Type
+    from types import TracebackType
     from busio import I2C
 except ImportError:
     pass
 
 from micropython import const
 from adafruit_bus_device.i2c_device import I2CDevice
-from adafruit_binascii import hexlify, unhexlify
 
 __version__ = "0.0.0+auto.0"
 __repo__ = "https://github.com/adafruit/Adafruit_CircuitPython_ATECC.git"
@@ -93,6 +90,7 @@ OP_LOCK = const(0x17)
 OP_GEN_KEY = const(0x40)
 OP_SIGN = const(0x41)
 OP_WRITE = const(0x12)
+OP_READ = const(0x02)
 
 # Maximum execution times, in milliseconds (9-4)
 EXEC_TIME = {
@@ -105,8 +103,31 @@ EXEC_TIME = {
     OP_GEN_KEY: const(115),
     OP_SIGN: const(70),
     OP_WRITE: const(26),
+    OP_READ: const(5),
 }
 
+# Time to wait before polling for GenKey and Sign responses, in seconds:
+# about half of their worst case execution time
+_GEN_KEY_DELAY = 0.0575
+_SIGN_DELAY = 0.035
+
+# Largest command packet: 8 bytes of framing plus up to 64 bytes of data
+_MAX_CMD_SIZE = const(72)
+# Largest response: count byte, 64 bytes of data and 2 bytes of CRC
+_MAX_RESP_SIZE = const(67)
+
+
+def _crc16_8005_entry(index):
+    # CRC16 (polynomial 0x8005) with LSB-first input bits, as used by the
+    # ATECC. Entries are computed for the bit-reflected polynomial 0xA001.
+    for _ in range(8):
+        index = (index >> 1) ^ (0xA001 & -(index & 1))
+    return index
+
+
+_CRC16_8005_TABLE = tuple(_crc16_8005_entry(i) for i in range(256))
+
+
 # pylint: disable=line-too-long
 """
 Configuration Zone Bytes
@@ -139,34 +160,28 @@ I2C Config
 
 """
 
-CFG_TLS = bytes(
-    bytearray(
-        unhexlify(
-            (
-                "01 23 00 00 00 00 50 00  00 00 00 00 00 c0 71 00"
-                "20 20 20 20 20 20 20 20  20 20 20 20 20 c0 00 55"
-                "00 83 20 87 20 87 20 87  2f 87 2f 8f 8f 9f 8f af"
-                "20 20 20 20 20 20 20 20  20 20 20 20 20 8f 00 00"
-                "00 00 00 00 00 00 00 00  00 00 00 00 20 20 20 20"
-                "20 20 20 20 20 20 20 20  20 af 8f ff ff ff ff 00"
-                "00 00 00 ff ff ff ff 00  20 20 20 20 20 20 20 20"
-                "20 20 20 20 20 00 00 00  ff ff ff ff ff ff ff ff"
-                "ff ff ff ff 20 20 20 20  20 20 20 20 20 20 20 20"
-                "20 ff ff ff ff 00 00 55  55 ff ff 00 00 00 00 00"
-                "00 33 20 20 20 20 20 20  20 20 20 20 20 20 20 00"
-                "33 00 33 00 33 00 33 00  1c 00 1c 00 1c 00 3c 00"
-                "3c 00 3c 00 3c 20 20 20  20 20 20 20 20 20 20 20"
-                "20 20 00 3c 00 3c 00 3c  00 1c 00"
-            ).replace(" ", "")
-        )
+_CFG_TLS = bytearray(
+    bytes.fromhex(
+        "01230000000050000000000000c07100"
+        "20202020202020202020202020c00055"
+        "00832087208720872f872f8f8f9f8faf"
+        "202020202020202020202020208f0000"
+        "00000000000000000000000020202020"
+        "202020202020202020af8fffffffff00"
+        "000000ffffffff002020202020202020"
+        "2020202020000000ffffffffffffffff"
+        "ffffffff202020202020202020202020"
+        "20ffffffff00005555ffff0000000000"
+        "00332020202020202020202020202000"
+        "33003300330033001c001c001c003c00"
+        "3c003c003c2020202020202020202020"
+        "2020003c003c003c001c00"
     )
 )
-
-# Convert I2C address to config byte 16 and update CFG_TLS
-_CFG_BYTES_LIST = list(bytearray(CFG_TLS))
-_CFG_BYTE_16 = bytes(bytearray(unhexlify(hex(_I2C_ADDR << 1).replace("0x", ""))))
-_CFG_BYTES_LIST_MOD = _CFG_BYTES_LIST[0:16] + list(_CFG_BYTE_16) + _CFG_BYTES_LIST[17:]
-CFG_TLS = bytes(_CFG_BYTES_LIST_MOD)
+# Set config byte 16 to the I2C address
+_CFG_TLS[16] = (_I2C_ADDR << 1) & 0xFF
+CFG_TLS = bytes(_CFG_TLS)
+del _CFG_TLS
 
 
 class ATECC:
@@ -175,7 +190,11 @@ class ATECC:
     """
 
     def __init__(
-        self, i2c_bus: I2C, address: int = _REG_ATECC_DEVICE_ADDR, debug: bool = False
+        self,
+        i2c_bus: I2C,
+        address: int = _REG_ATECC_DEVICE_ADDR,
+        debug: bool = False,
+        verify: bool = True,
     ):
         """
         Initializes an ATECC device.
@@ -183,19 +202,56 @@ class ATECC:
         :param busio i2c_bus: I2C Bus object.
         :param int address: Device address, defaults to _ATECC_DEVICE_ADDR.
         :param bool debug: Library debugging enabled
+        :param bool verify: Check the chip revision on init, defaults to True.
         """
         self._debug = debug
-        self._i2cbuf = bytearray(12)
+        self._version = None
+        self._cmdbuf = bytearray(_MAX_CMD_SIZE)
+        self._cmdmv = memoryview(self._cmdbuf)
+        self._respbuf = bytearray(_MAX_RESP_SIZE)
+        self._respmv = memoryview(self._respbuf)
+        # nesting depth of `with` blocks keeping the chip awake
+        self._awake = 0
         # don't probe, the device will NACK until woken up
         self._wake_device = I2CDevice(i2c_bus, 0x00, probe=False)
         self._i2c_device = I2CDevice(i2c_bus, address, probe=False)
-        if (self.version() >> 8) not in (_ATECC_508_VER, _ATECC_608_VER):
+        if verify and (self.version() >> 8) not in (_ATECC_508_VER, _ATECC_608_VER):
             raise RuntimeError(
                 "Failed to find 608 or 508 chip. Please check your wiring."
             )
 
+    def __enter__(self) -> "ATECC":
+        """Keeps the chip awake for the duration of a ``with`` block.
+
+        The chip is woken once on entry and idled once on exit. Inside the
+        block, wakeup() and idle() do nothing, so commands skip their
+        individual wakeup/idle round trips. Blocks can be nested; only the
+        outermost one wakes and idles the chip. sleep() raises a
+        RuntimeError inside a block, since the chip could not be woken
+        again until the block exits.
+
+        The ATECC watchdog puts the chip to sleep about 1.3 seconds after
+        waking, so keep the block short.
+        """
+        if not self._awake:
+            self.wakeup()
+        self._awake += 1
+        return self
+
+    def __exit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._awake -= 1
+        if not self._awake:
+            self.idle()
+
     def wakeup(self):
         """Wakes up THE ATECC608A from sleep or idle modes."""
+        if self._awake:
+            return
         # This is a hack to generate the ATECC Wake condition, which is SDA
         # held low for t > 60us (twlo). For an I2C clock freq of 100kHz, 8
         # clock cycles will be 80us. This signal is generated by trying to
@@ -212,19 +268,24 @@ class ATECC:
     def idle(self):
         """Puts the chip into idle mode
         until wakeup is called.
+        Does nothing while the chip is held awake by a ``with`` block.
         """
-        self._i2cbuf[0] = 0x2
+        if self._awake:
+            return
+        self._cmdbuf[0] = 0x2
         with self._i2c_device as i2c:
-            i2c.write(self._i2cbuf, end=1)
+            i2c.write(self._cmdbuf, end=1)
         time.sleep(0.001)
 
     def sleep(self):
         """Puts the chip into low-power
         sleep mode until wakeup is called.
         """
-        self._i2cbuf[0] = 0x1
+        if self._awake:
+            raise RuntimeError("Can't sleep while held awake by a with block.")
+        self._cmdbuf[0] = 0x1
         with self._i2c_device as i2c:
-            i2c.write(self._i2cbuf, end=1)
+            i2c.write(self._cmdbuf, end=1)
         time.sleep(0.001)
 
     @property
@@ -238,33 +299,22 @@ class ATECC:
     @property
     def serial_number(self):
         """Returns the ATECC serial number."""
-        serial_num = bytearray(9)
-        # 4-byte reads only
-        temp_sn = bytearray(4)
-        # SN<0:3>
-        self._read(0, 0x00, temp_sn)
-        serial_num[0:4] = temp_sn
-        time.sleep(0.001)
-        # SN<4:8>
-        self._read(0, 0x02, temp_sn)
-        serial_num[4:8] = temp_sn
-        time.sleep(0.001)
-        # Append Rev
-        self._read(0, 0x03, temp_sn)
-        serial_num[8] = temp_sn[0]
-        time.sleep(0.001)
+        # one 32-byte read of config block 0 covers SN<0:3> (bytes 0-3)
+        # and SN<4:8> (bytes 8-12)
+        config = bytearray(32)
+        self._read(0, 0x00, config)
+        serial_num = config[0:4] + config[8:13]
         # neaten up the serial for printing
-        serial_num = str(hexlify(serial_num), "utf-8")
-        serial_num = serial_num.upper()
-        return serial_num
+        return "".join("%02X" % b for b in serial_num)
 
     def version(self):
-        """Returns the ATECC608As revision number"""
-        self.wakeup()
-        self.idle()
-        vers = bytearray(4)
-        vers = self.info(0x00)
-        return (vers[2] << 8) | vers[3]
+        """Returns the ATECC608As revision number, read once and cached"""
+        if self._version is None:
+            self.wakeup()
+            self.idle()
+            vers = self.info(0x00)
+            self._version = (vers[2] << 8) | vers[3]
+        return self._version
 
     def lock_all_zones(self):
         """Locks Config, Data and OTP Zones."""
@@ -276,11 +326,11 @@ class ATECC:
         :param int zone: ATECC zone to lock.
         """
         self.wakeup()
-        self._send_command(0x17, 0x80 | zone, 0x0000)
-        time.sleep(EXEC_TIME[OP_LOCK] / 1000)
+        self._send_command_nodata(OP_LOCK, 0x80 | zone, 0x0000)
         res = bytearray(1)
-        self._get_response(res)
-        assert res[0] == 0x00, "Failed locking ATECC!"
+        self._poll_response(res, OP_LOCK)
+        if res[0] != 0x00:
+            raise RuntimeError("Failed locking ATECC!")
         self.idle()
 
     def info(self, mode: int, param: Optional[Any] = None) -> bytearray:
@@ -293,12 +343,11 @@ class ATECC:
         """
         self.wakeup()
         if not param:
-            self._send_command(OP_INFO, mode)
+            self._send_command_nodata(OP_INFO, mode)
         else:
-            self._send_command(OP_INFO, mode, param)
-        time.sleep(EXEC_TIME[OP_INFO] / 1000)
+            self._send_command_nodata(OP_INFO, mode, param)
         info_out = bytearray(4)
-        self._get_response(info_out)
+        self._poll_response(info_out, OP_INFO)
         self.idle()
         return info_out
 
@@ -327,13 +376,11 @@ class ATECC:
             calculated_nonce = bytearray(1)
         else:
             raise RuntimeError("Invalid mode specified!")
-        time.sleep(EXEC_TIME[OP_NONCE] / 1000)
-        self._get_response(calculated_nonce)
-        time.sleep(1 / 1000)
+        self._poll_response(calculated_nonce, OP_NONCE)
+        time.sleep(0.001)
         if mode == 0x03:
-            assert (
-                calculated_nonce[0] == 0x00
-            ), "Incorrectly calculated nonce in pass-thru mode"
+            if calculated_nonce[0] != 0x00:
+                raise RuntimeError("Incorrectly calculated nonce in pass-thru mode")
         self.idle()
         return calculated_nonce
 
@@ -343,21 +390,17 @@ class ATECC:
         counters located on the device within the configuration zone.
         The maximum value that the counter may have is 2,097,151.
 
-        :param int counter: Device's counter to increment.
+        :param int counter: Device's counter to use, 0 or 1.
         :param bool increment_counter: Increments the value of the counter specified.
         :return: bytearray with the count
         """
-        counter = 0x00
         self.wakeup()
-        if counter == 1:
-            counter = 0x01
         if increment_counter:
-            self._send_command(OP_COUNTER, 0x01, counter)
+            self._send_command_nodata(OP_COUNTER, 0x01, counter & 0x01)
         else:
-            self._send_command(OP_COUNTER, 0x00, counter)
-        time.sleep(EXEC_TIME[OP_COUNTER] / 1000)
+            self._send_command_nodata(OP_COUNTER, 0x00, counter & 0x01)
         count = bytearray(4)
-        self._get_response(count)
+        self._poll_response(count, OP_COUNTER)
         self.idle()
         return count
 
@@ -369,37 +412,32 @@ class ATECC:
         :param int rnd_max: Maximum random value to generate.
         :return: Random integer
         """
-        if rnd_max:
-            rnd_min = 0
         if rnd_min >= rnd_max:
             return rnd_min
         delta = rnd_max - rnd_min
         r = bytearray(16)
-        r = self._random(r)
-        data = 0
-        for i in enumerate(r):
-            data += r[i[0]]
-        if data < 0:
-            data = -data
-        data = data % delta
+        self._random(r)
+        data = sum(r) % delta
         return data + rnd_min
 
     def _random(self, data: bytearray) -> bytearray:
         """
-        Initializes the random number generator and returns.
+        Fills the provided buffer with random bytes from the device.
 
         :param bytearray data: Response buffer.
         :return: bytearray
         """
         self.wakeup()
+        resp = bytearray(32)
+        resp_mv = memoryview(resp)
         data_len = len(data)
+        offset = 0
         while data_len:
-            self._send_command(OP_RANDOM, 0x00, 0x0000)
-            time.sleep(EXEC_TIME[OP_RANDOM] / 1000)
-            resp = bytearray(32)
-            self._get_response(resp)
+            self._send_command_nodata(OP_RANDOM, 0x00, 0x0000)
+            self._poll_response(resp, OP_RANDOM)
             copy_len = min(32, data_len)
-            data = resp[0:copy_len]
+            data[offset : offset + copy_len] = resp_mv[:copy_len]
+            offset += copy_len
             data_len -= copy_len
         self.idle()
         return data
@@ -412,11 +450,11 @@ class ATECC:
         This method MUST be called before sha_update or sha_digest
         """
         self.wakeup()
-        self._send_command(OP_SHA, 0x00)
-        time.sleep(EXEC_TIME[OP_SHA] / 1000)
+        self._send_command_nodata(OP_SHA, 0x00)
         status = bytearray(1)
-        self._get_response(status)
-        assert status[0] == 0x00, "Error during sha_start."
+        self._poll_response(status, OP_SHA)
+        if status[0] != 0x00:
+            raise RuntimeError("Error during sha_start.")
         self.idle()
         return status
 
@@ -430,10 +468,10 @@ class ATECC:
         """
         self.wakeup()
         self._send_command(OP_SHA, 0x01, 64, message)
-        time.sleep(EXEC_TIME[OP_SHA] / 1000)
         status = bytearray(1)
-        self._get_response(status)
-        assert status[0] == 0x00, "Error during SHA Update"
+        self._poll_response(status, OP_SHA)
+        if status[0] != 0x00:
+            raise RuntimeError("Error during SHA Update")
         self.idle()
         return status
 
@@ -453,14 +491,39 @@ class ATECC:
         if message:
             self._send_command(OP_SHA, 0x02, len(message), message)
         else:
-            self._send_command(OP_SHA, 0x02)
-        time.sleep(EXEC_TIME[OP_SHA] / 1000)
+            self._send_command_nodata(OP_SHA, 0x02)
         digest = bytearray(32)
-        self._get_response(digest)
+        self._poll_response(digest, OP_SHA)
         assert len(digest) == 32, "SHA response length does not match expected length."
         self.idle()
         return digest
 
+    def sha(self, message: bytes) -> bytearray:
+        """
+        Returns the SHA-256 digest of a message of any length.
+
+        Runs sha_start, sha_update for every full 64-byte block and
+        sha_digest for the remainder, without waking and idling the
+        chip around every block.
+
+        :param bytes message: Data to hash.
+        :return: bytearray containing the digest
+        """
+        view = memoryview(message)
+        full = len(view) - len(view) % 64
+        digest = None
+        # Stay awake for up to 8 blocks at a time, short enough for the
+        # watchdog. The SHA context is kept while the chip idles.
+        for group in range(0, max(full, 1), 512):
+            with self:
+                if not group:
+                    self.sha_start()
+                for offset in range(group, min(group + 512, full), 64):
+                    self.sha_update(view[offset : offset + 64])
+                if group + 512 >= full:
+                    digest = self.sha_digest(bytearray(view[full:]))
+        return digest
+
     def gen_key(
         self, key: bytearray, slot_num: int, private_key: bool = False
     ) -> bytearray:
@@ -475,11 +538,11 @@ class ATECC:
         assert 0 <= slot_num <= 4, "Provided slot must be between 0 and 4."
         self.wakeup()
         if private_key:
-            self._send_command(OP_GEN_KEY, 0x04, slot_num)
+            self._send_command_nodata(OP_GEN_KEY, 0x04, slot_num)
         else:
-            self._send_command(OP_GEN_KEY, 0x00, slot_num)
-        time.sleep(EXEC_TIME[OP_GEN_KEY] / 1000)
-        self._get_response(key)
+            self._send_command_nodata(OP_GEN_KEY, 0x00, slot_num)
+        # wait about half the worst case before polling
+        self._poll_response(key, OP_GEN_KEY, _GEN_KEY_DELAY)
         time.sleep(0.001)
         self.idle()
         return key
@@ -492,12 +555,11 @@ class ATECC:
         :param bytearray message: Message to be signed.
         :return: bytearray containing the signature
         """
-        # Load the message digest into TempKey using Nonce (9.1.8)
-        self.nonce(message, 0x03)
-        # Generate and return a signature
-        sig = bytearray(64)
-        sig = self.sign(slot)
-        return sig
+        with self:
+            # Load the message digest into TempKey using Nonce (9.1.8)
+            self.nonce(message, 0x03)
+            # Generate and return a signature
+            return self.sign(slot)
 
     def sign(self, slot_id: int) -> bytearray:
         """
@@ -507,10 +569,10 @@ class ATECC:
         :return: bytearray containing the signature
         """
         self.wakeup()
-        self._send_command(0x41, 0x80, slot_id)
-        time.sleep(EXEC_TIME[OP_SIGN] / 1000)
+        self._send_command_nodata(OP_SIGN, 0x80, slot_id)
         signature = bytearray(64)
-        self._get_response(signature)
+        # wait about half the worst case before polling
+        self._poll_response(signature, OP_SIGN, _SIGN_DELAY)
         self.idle()
         return signature
 
@@ -520,12 +582,15 @@ class ATECC:
 
         :param bytearray data: Configuration data to-write
         """
-        # First 16 bytes of data are skipped, not writable
-        for i in range(16, 128, 4):
-            if i == 84:
-                # can't write
-                continue
-            self._write(0, i // 4, data[i : i + 4])
+        # Stay awake across each 32-byte block, short enough for the watchdog
+        for block in range(0, 128, 32):
+            with self:
+                # First 16 bytes of data are skipped, not writable
+                for i in range(max(block, 16), block + 32, 4):
+                    if i == 84:
+                        # can't write
+                        continue
+                    self._write(0, i // 4, data[i : i + 4])
 
     def _write(self, zone: Any, address: int, buffer: bytearray):
         """
@@ -540,10 +605,9 @@ class ATECC:
             raise RuntimeError("Only 4 or 32-byte writes supported.")
         if len(buffer) == 32:
             zone |= 0x80
-        self._send_command(0x12, zone, address, buffer)
-        time.sleep(26 / 1000)
+        self._send_command(OP_WRITE, zone, address, buffer)
         status = bytearray(1)
-        self._get_response(status)
+        self._poll_response(status, OP_WRITE)
         self.idle()
 
     def _read(self, zone: int, address: int, buffer: bytearray):
@@ -559,14 +623,13 @@ class ATECC:
             raise RuntimeError("Only 4 and 32 byte reads supported")
         if len(buffer) == 32:
             zone |= 0x80
-        self._send_command(2, zone, address)
-        time.sleep(0.005)
-        self._get_response(buffer)
+        self._send_command_nodata(OP_READ, zone, address)
+        self._poll_response(buffer, OP_READ)
         time.sleep(0.001)
         self.idle()
 
     def _send_command(
-        self, opcode: int, param_1: int, param_2: int = 0x00, data: Sized = ""
+        self, opcode: int, param_1: int, param_2: int = 0x00, data: Sized = b""
     ):
         """
         Sends a security command packet over i2c.
@@ -576,55 +639,102 @@ class ATECC:
         :param byte param_2: The second parameter, can be two bytes.
         :param byte param_3 data: Optional remaining input data.
         """
-        # assembling command packet
-        command_packet = bytearray(8 + len(data))
-        # word address
-        command_packet[0] = 0x03
-        # i/o group: count
-        command_packet[1] = len(command_packet) - 1  # count
-        # security command packets
-        command_packet[2] = opcode
-        command_packet[3] = param_1
-        command_packet[4] = param_2 & 0xFF
-        command_packet[5] = param_2 >> 8
-        for i, cmd in enumerate(data):
-            command_packet[6 + i] = cmd
-        if self._debug:
-            print("Command Packet Sz: ", len(command_packet))
-            print("\tSending:", [hex(i) for i in command_packet])
+        # assembling command packet: word address, count, opcode, params
+        total = 8 + len(data)
+        pack_into("<BBBBH", self._cmdbuf, 0, 0x03, total - 1, opcode, param_1, param_2)
+        if data:
+            if not isinstance(data, (bytes, bytearray, memoryview)):
+                # e.g. a list of ints, which memoryview can't copy from
+                data = bytes(data)
+            self._cmdmv[6 : total - 2] = data
         # Checksum, CRC16 verification
-        crc = self._at_crc(command_packet[1:-2])
-        command_packet[-1] = crc >> 8
-        command_packet[-2] = crc & 0xFF
+        crc = self._at_crc(self._cmdmv[1 : total - 2])
+        pack_into("<H", self._cmdbuf, total - 2, crc)
+        self._send_packet(self._cmdbuf, total)
+
+    def _send_command_nodata(self, opcode: int, param_1: int, param_2: int = 0x00):
+        """
+        Sends a security command packet without input data over i2c.
+
+        :param byte opcode: The command Opcode
+        :param byte param_1: The first parameter
+        :param byte param_2: The second parameter, can be two bytes.
+        """
+        # word address 0x03, count 0x07
+        pack_into("<BBBBH", self._cmdbuf, 0, 0x03, 0x07, opcode, param_1, param_2)
+        pack_into("<H", self._cmdbuf, 6, self._at_crc(self._cmdmv[1:6]))
+        self._send_packet(self._cmdbuf, 8)
+
+    def _send_packet(self, packet: bytearray, length: int):
+        """
+        Writes an assembled command packet to the device.
 
+        :param bytearray packet: Buffer holding the packet
+        :param int length: Length of the packet within the buffer
+        """
+        if self._debug:
+            print("Command Packet Sz: ", length)
+            print("\tSending:", [hex(i) for i in packet[:length]])
         self.wakeup()
         with self._i2c_device as i2c:
-            i2c.write(command_packet)
+            i2c.write(packet, end=length)
         # small sleep
         time.sleep(0.001)
 
-    def _get_response(self, buf: Sized, length: int = None, retries: int = 20) -> int:
-        self.wakeup()
+    def _poll_response(
+        self, buf: Sized, opcode: int, delay: float = 0, length: int = None
+    ) -> int:
+        """
+        Waits for a command to finish executing and reads its response.
+
+        The chip NACKs reads while it is busy, so rather than always waiting
+        for the worst case execution time, poll until it ACKs. EXEC_TIME is
+        only used as the upper bound. A response that fails its CRC check
+        is not retried.
+
+        :param buf: Buffer to read the response into
+        :param int opcode: Opcode of the command being executed
+        :param float delay: Time to wait before the first read, in seconds
+        :param int length: Number of bytes to read, defaults to len(buf)
+        :return: The first byte of the response
+        """
+        time.sleep(delay)
+        # Retry NACKs every millisecond for up to the worst case execution
+        # time, plus the usual retries on top
+        return self._get_response(buf, length, EXEC_TIME[opcode] + 20, 0.001)
+
+    def _get_response(
+        self, buf: Sized, length: int = None, retries: int = 20, interval: float = 0
+    ) -> int:
+        """
+        Reads a response packet from the chip, without waking it first.
+
+        :param buf: Buffer to read the response into
+        :param int length: Number of bytes to read, defaults to len(buf)
+        :param int retries: Number of reads to attempt while the chip NACKs
+        :param float interval: Time to wait between attempts, in seconds
+        :return: The first byte of the response
+        """
         if length is None:
             length = len(buf)
-        response = bytearray(length + 3)  # 1 byte header, 2 bytes CRC, len bytes data
-        with self._i2c_device as i2c:
-            for _ in range(retries):
-                try:
-                    i2c.readinto(response)
-                    break
-                except OSError:
-                    pass
-            else:
-                raise RuntimeError("Failed to read data from chip")
+        # 1 byte header, len bytes data, 2 bytes CRC
+        response = self._respmv[: length + 3]
+        for _ in range(retries):
+            try:
+                with self._i2c_device as i2c:
+                    i2c.readinto(self._respbuf, end=length + 3)
+                break
+            except OSError:
+                time.sleep(interval)
+        else:
+            raise RuntimeError("Failed to read data from chip")
         if self._debug:
             print("\tReceived: ", [hex(i) for i in response])
         crc = response[-2] | (response[-1] << 8)
         crc2 = self._at_crc(response[0:-2])
         if crc != crc2:
             raise RuntimeError("CRC Mismatch")
-        for i in range(length):
-            buf[i] = response[i + 1]
+        buf[:length] = response[1 : length + 1]
         return response[1]
 
     @staticmethod
@@ -633,17 +743,13 @@ class ATECC:
             length = len(data)
         if not data or not length:
             return 0
-        polynom = 0x8005
+        # local lookups are cheaper than globals inside the loop
+        table = _CRC16_8005_TABLE
         crc = 0x0
         for b in data:
-            for shift in range(8):
-                data_bit = 0
-                if b & (1 << shift):
-                    data_bit = 1
-                crc_bit = (crc >> 15) & 0x1
-                crc <<= 1
-                crc &= 0xFFFF
-                if data_bit != crc_bit:
-                    crc ^= polynom
-                    crc &= 0xFFFF
-        return crc & 0xFFFF
+            crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+        # The table runs the register bit-reflected, undo that once here
+        crc = ((crc >> 1) & 0x5555) | ((crc & 0x5555) << 1)
+        crc = ((crc >> 2) & 0x3333) | ((crc & 0x3333) << 2)
+        crc = ((crc >> 4) & 0x0F0F) | ((crc & 0x0F0F) << 4)
+        return ((crc >> 8) | (crc << 8)) & 0xFFFF
@@ -35,6 +35,9 @@ Implementation Notes
 
 * Adafruit CircuitPython firmware for the supported boards:
   https://github.com/adafruit/circuitpython/releases
+
+* Adafruit binascii library:
+  https://github.com/adafruit/Adafruit_CircuitPython_binascii
 """
 from adafruit_binascii import b2a_base64
 import adafruit_atecc.adafruit_atecc_asn1 as asn1